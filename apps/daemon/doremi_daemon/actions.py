@@ -3,11 +3,15 @@ Action registry: builtin recorder+STT, system no-op, and companion bridge.
 """
 from __future__ import annotations
 import json
+import os
 import subprocess
 from typing import Any
 
 from .audio import record_seconds, write_wav
-from .transcribe import LocalWhisper
+from .transcribe import WINDOW_SECONDS, LocalWhisper
+
+# Shorter chunks cost more in per-chunk overhead than they gain in parallelism
+MIN_CHUNK_SECONDS = 5.0
 
 
 def run_companion(command: str, args: list[str]) -> int:
@@ -31,9 +35,10 @@ def action_companion(action_cfg: dict) -> None:
     print(f"[companion] {cmd} exit={rc}")
 
 
-def action_record_and_transcribe(cfg: dict, mic_device: str, sample_rate: int) -> None:
+def action_record_and_transcribe(cfg: dict, mic_device: str, sample_rate: int, vad_aggressiveness: int = 2) -> None:
     """
     Records N seconds, writes WAV, runs local Whisper, dumps JSON (optional).
+    `vad_aggressiveness` (the daemon's vad.aggressiveness) drives chunk splitting.
     """
     seconds = float(cfg.get("record_seconds", 20))
     out_wav = cfg.get("save_wav_to", "/tmp/doremi_last.wav")
@@ -41,15 +46,41 @@ def action_record_and_transcribe(cfg: dict, mic_device: str, sample_rate: int) -
     model = stt_cfg.get("model", "tiny")
     compute_type = stt_cfg.get("compute_type", "int8")
     engine = stt_cfg.get("engine", "faster-whisper")
+    language = stt_cfg.get("language")
+    chunk_cfg: dict[str, Any] = stt_cfg.get("chunking", {})
+    max_chunk = float(chunk_cfg.get("max_chunk_seconds", 30))
+    if not MIN_CHUNK_SECONDS <= max_chunk <= WINDOW_SECONDS:
+        clamped = min(max(max_chunk, MIN_CHUNK_SECONDS), WINDOW_SECONDS)
+        print(f"[warn] stt.chunking.max_chunk_seconds={max_chunk} out of range, using {clamped}")
+        max_chunk = clamped
+    # Padding comes out of the chunk budget; keep at least half of it for new audio
+    overlap = float(chunk_cfg.get("overlap_seconds", 0.5))
+    if not 0.0 <= overlap <= max_chunk / 4:
+        clamped = min(max(overlap, 0.0), max_chunk / 4)
+        print(f"[warn] stt.chunking.overlap_seconds={overlap} out of range, using {clamped}")
+        overlap = clamped
+    chunked = bool(chunk_cfg.get("enabled", False)) and seconds > max_chunk
 
     print(f"[record] {seconds}s…")
     samples = record_seconds(seconds=seconds, sample_rate=sample_rate, device=mic_device)
     write_wav(out_wav, samples, sample_rate)
 
-    if engine == "faster-whisper":
+    if engine == "faster-whisper" and chunked:
+        workers = max(1, int(chunk_cfg.get("workers", 0)) or (os.cpu_count() or 1))
+        print(f"[stt] model={model} compute={compute_type} chunked workers={workers}")
+        whisper = LocalWhisper(model, compute_type, num_workers=workers)
+        res = whisper.transcribe_chunked(
+            out_wav,
+            max_chunk_seconds=max_chunk,
+            overlap_seconds=overlap,
+            language=language,
+            vad_aggressiveness=vad_aggressiveness,
+        )
+        print(f"[stt] {len(res['chunks'])} chunks in {res['wall_seconds']}s")
+    elif engine == "faster-whisper":
         print(f"[stt] model={model} compute={compute_type}")
         whisper = LocalWhisper(model, compute_type)
-        res = whisper.transcribe(out_wav)
+        res = whisper.transcribe(out_wav, language=language)
     else:
         res = {"text": "", "language": "unknown", "duration": 0}
 
@@ -64,7 +95,13 @@ def action_system_noop(_: dict) -> None:
     print("[system] noop")
 
 
-def dispatch(action_name: str, actions_cfg: dict, mic_device: str, sample_rate: int) -> None:
+def dispatch(
+    action_name: str,
+    actions_cfg: dict,
+    mic_device: str,
+    sample_rate: int,
+    vad_aggressiveness: int = 2,
+) -> None:
     """
     Lookup and run the action by name.
     """
@@ -78,7 +115,7 @@ def dispatch(action_name: str, actions_cfg: dict, mic_device: str, sample_rate:
     if kind == "companion":
         action_companion(action)
     elif kind == "builtin" and action_name == "record-and-transcribe":
-        action_record_and_transcribe(action, mic_device, sample_rate)
+        action_record_and_transcribe(action, mic_device, sample_rate, vad_aggressiveness)
     elif action_name.startswith("system:"):
         action_system_noop(action)
     else:
@@ -8,7 +8,7 @@ from typing import Dict, List, Tuple
 
 import numpy as np
 
-from .hotword_template import _mfcc, _cosine
+from .hotword_template import _TemplateCache, _cosine, _mfcc, _stamp, _sync_npz
 
 
 class CommandRecognizer:
@@ -33,19 +33,33 @@ class CommandRecognizer:
         self.dir = Path(template_dir)
         self.sensitivity = sensitivity
         self.db: Dict[str, List[np.ndarray]] = {}
+        self._cache: _TemplateCache = {}
         self._load()
 
     def _load(self) -> None:
-        if not self.dir.exists():
-            return
-        for p in sorted(self.dir.glob("cmd_*.npz")):
-            name = p.stem  # e.g., cmd_record_00
-            parts = name.split("_")
-            if len(parts) < 2:
-                continue
-            label = parts[1]  # 'record'
-            F = np.load(p)["mfcc"].astype(np.float32)
-            self.db.setdefault(label, []).append(F)
+        self.sync()
+
+    def sync(self) -> Tuple[int, int]:
+        """
+        Reloads only command templates added, changed or removed on disk and
+        swaps in a rebuilt `db` in one assignment.
+
+        Returns:
+            (added_or_changed, removed) counts.
+        """
+        paths = []
+        if self.dir.exists():
+            for p in sorted(self.dir.glob("cmd_*.npz")):
+                if len(p.stem.split("_")) >= 2:  # e.g., cmd_record_00
+                    paths.append(p)
+        cache, added, removed = _sync_npz(paths, self._cache)
+        db: Dict[str, List[np.ndarray]] = {}
+        for p, (_, F) in cache.items():
+            label = p.stem.split("_")[1]  # 'record'
+            db.setdefault(label, []).append(F)
+        self._cache = cache
+        self.db = db
+        return (len(added), len(removed))
 
     def best_label(self, x_f32: np.ndarray) -> Tuple[str | None, float]:
         """
@@ -77,5 +91,6 @@ class CommandRecognizer:
         out = self.dir / f"cmd_{label}_{idx:02d}.npz"
         np.savez_compressed(out, mfcc=F)
         # update db
+        self._cache[out] = (_stamp(out), F)
         self.db.setdefault(label, []).append(F)
         return out
@@ -3,8 +3,9 @@ Template-based wakeword with local enrollment (MFCC + cosine).
 No cloud. Stores your "doremi" templates under templates/{label}_*.npz
 """
 from __future__ import annotations
+import zipfile
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Tuple
 
 import librosa
 import numpy as np
@@ -36,6 +37,53 @@ def _cosine(a: NDArray[np.float32], b: NDArray[np.float32]) -> float:
     return float(np.dot(af, bf) / (na * nb))
 
 
+# path -> ((mtime_ns, size), mfcc) for templates already loaded from disk
+_TemplateCache = Dict[Path, Tuple[Tuple[int, int], NDArray[np.float32]]]
+
+
+def _stamp(p: Path) -> Tuple[int, int]:
+    """(mtime_ns, size) of a file; size catches rewrites on coarse-mtime filesystems."""
+    st = p.stat()
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _sync_npz(paths: Iterable[Path], cache: _TemplateCache) -> Tuple[_TemplateCache, List[Path], List[Path]]:
+    """
+    Incrementally refresh a template cache against the files on disk.
+    Unchanged files (same mtime and size) are reused without re-reading them.
+
+    Args:
+        paths: template files currently present, in load order.
+        cache: previous cache; not modified.
+
+    Returns:
+        (new_cache, added_or_changed, removed)
+    """
+    fresh: _TemplateCache = {}
+    added: List[Path] = []
+    for p in paths:
+        try:
+            stamp = _stamp(p)
+        except FileNotFoundError:
+            continue
+        prev = cache.get(p)
+        if prev is not None and prev[0] == stamp:
+            fresh[p] = prev
+            continue
+        try:
+            F = np.load(p)["mfcc"].astype(np.float32)
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile) as e:
+            # Most likely still being written by enrollment; keep the old copy if any.
+            print(f"[reload] skip {p.name}: {e}")
+            if prev is not None:
+                fresh[p] = prev
+            continue
+        fresh[p] = (stamp, F)
+        added.append(p)
+    removed = [p for p in cache if p not in fresh]
+    return fresh, added, removed
+
+
 class TemplateWakeword:
     """
     Local template-based detector with user enrollment.
@@ -54,13 +102,26 @@ class TemplateWakeword:
         self.dir = Path(template_dir)
         self.dir.mkdir(parents=True, exist_ok=True)
         self.templates: List[NDArray[np.float32]] = []
+        self._cache: _TemplateCache = {}
         self._load()
 
     def _load(self) -> None:
         """Loads all npz templates for the label from disk."""
-        for p in sorted(self.dir.glob(f"{self.label}_*.npz")):
-            data = np.load(p)
-            self.templates.append(data["mfcc"].astype(np.float32))
+        self.sync()
+
+    def sync(self) -> Tuple[int, int]:
+        """
+        Picks up templates added, changed or removed on disk since the last
+        load. Unchanged templates are kept as-is.
+
+        Returns:
+            (added_or_changed, removed) counts.
+        """
+        paths = sorted(self.dir.glob(f"{self.label}_*.npz")) if self.dir.exists() else []
+        cache, added, removed = _sync_npz(paths, self._cache)
+        self._cache = cache
+        self.templates = [F for _, F in cache.values()]
+        return (len(added), len(removed))
 
     def enroll_from_float32(self, x: NDArray[np.float32]) -> Path:
         """
@@ -72,11 +133,12 @@ class TemplateWakeword:
         Returns:
             Path to saved template.
         """
-        F = _mfcc(x, self.sr)
+        F = _mfcc(x, self.sr).astype(np.float32)
         idx = len(self.templates)
         out = self.dir / f"{self.label}_{idx:02d}.npz"
-        np.savez_compressed(out, mfcc=F.astype(np.float32))
-        self.templates.append(F.astype(np.float32))
+        np.savez_compressed(out, mfcc=F)
+        self._cache[out] = (_stamp(out), F)
+        self.templates.append(F)
         return out
 
     def detected(self, x: NDArray[np.float32]) -> Tuple[bool, float]:
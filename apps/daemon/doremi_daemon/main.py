@@ -3,6 +3,7 @@ Doremi Daemon: template wakeword + actions + optional follow-command.
 """
 from __future__ import annotations
 import argparse
+from pathlib import Path
 from typing import List
 
 import numpy as np
@@ -13,6 +14,7 @@ from .vad import VADGate
 from .actions import dispatch
 from .hotword_template import TemplateWakeword
 from .commands import CommandRecognizer
+from .reload import PathWatcher, parse_settings
 
 
 def load_cfg(path: str) -> dict:
@@ -30,9 +32,9 @@ def is_ide_action(name: str) -> bool:
     return name.startswith("ide:")
 
 
-def run_actions(names: List[str], actions_cfg: dict, device: str, sr: int) -> None:
+def run_actions(names: List[str], actions_cfg: dict, device: str, sr: int, vad_aggressiveness: int = 2) -> None:
     for name in names:
-        dispatch(name, actions_cfg, device, sr)
+        dispatch(name, actions_cfg, device, sr, vad_aggressiveness)
 
 
 def main() -> None:
@@ -52,31 +54,94 @@ def main() -> None:
 
     # VAD
     vad_cfg = cfg.get("vad", {})
+    vad_aggr = int(vad_cfg.get("aggressiveness", 2))
     vad = (
-        VADGate(aggressiveness=int(vad_cfg.get("aggressiveness", 2)), sample_rate=sr, frame_ms=frame_ms)
+        VADGate(aggressiveness=vad_aggr, sample_rate=sr, frame_ms=frame_ms)
         if vad_cfg.get("enabled", True)
         else None
     )
 
-    # Wakeword
-    ww_cfg = cfg.get("wakeword", {})
-    label = ww_cfg.get("label", "doremi")
-    sensitivity = float(ww_cfg.get("sensitivity", 0.6))
-    template_dir = ww_cfg.get("enroll", {}).get("template_dir", "templates")
-    detector = TemplateWakeword(label=label, sr=sr, threshold=sensitivity, template_dir=template_dir)
+    # Wakeword + follow-command + actions (the part that can be hot-reloaded)
+    settings = parse_settings(cfg)
+    detector = TemplateWakeword(
+        label=settings.label, sr=sr, threshold=settings.sensitivity, template_dir=settings.template_dir
+    )
     if not detector.templates:
-        print(f"[warn] no templates found for '{label}'. Run enrollment first.")
-
-    # Follow-command
-    fc_cfg = cfg.get("follow_command", {})
-    fc_enabled = bool(fc_cfg.get("enabled", False))
-    fc_window_sec = float(fc_cfg.get("window_seconds", 1.2))
-    fc_threshold = float(fc_cfg.get("sensitivity", 0.65))
-    fc_default = fc_cfg.get("default_on_uncertain", "ide:record")
-    fc_map = fc_cfg.get("map", {})
-    cmd_rec = CommandRecognizer(sr=sr, template_dir=template_dir, sensitivity=fc_threshold) if fc_enabled else None
+        print(f"[warn] no templates found for '{settings.label}'. Run enrollment first.")
+    cmd_rec = (
+        CommandRecognizer(sr=sr, template_dir=settings.template_dir, sensitivity=settings.fc_sensitivity)
+        if settings.fc_enabled
+        else None
+    )
 
-    on_detect: List[str] = list(cfg.get("actions_on_detect", []))
+    # Hot reload: poll config + template dir and apply diffs between frames
+    rl_cfg = cfg.get("reload", {})
+    rl_enabled = bool(rl_cfg.get("enabled", True))
+    rl_interval = float(rl_cfg.get("poll_seconds", 1.0))
+    cfg_watch = PathWatcher(args.config, interval=rl_interval) if rl_enabled else None
+    tpl_watch = PathWatcher(settings.template_dir, "*.npz", interval=rl_interval) if rl_enabled else None
+
+    def sync_templates() -> None:
+        added, removed = detector.sync()
+        if cmd_rec is not None:
+            c_added, c_removed = cmd_rec.sync()
+            added += c_added
+            removed += c_removed
+        if added or removed:
+            print(f"[reload] templates +{added} -{removed}")
+        if not detector.templates:
+            print(f"[warn] no templates found for '{settings.label}'. Run enrollment first.")
+
+    def apply_cfg(new_cfg: dict) -> None:
+        """
+        Swaps in settings from a reloaded config once they all validate.
+        Mic, VAD and reload settings need a restart.
+        """
+        nonlocal cfg, settings, cmd_rec, tpl_watch
+
+        try:
+            new = parse_settings(new_cfg)
+            dir_changed = (new.label, new.template_dir) != (settings.label, settings.template_dir)
+            if dir_changed:
+                Path(new.template_dir).mkdir(parents=True, exist_ok=True)
+            new_cmd_rec = cmd_rec
+            if new_cmd_rec is None and new.fc_enabled:
+                new_cmd_rec = CommandRecognizer(sr=sr, template_dir=new.template_dir, sensitivity=new.fc_sensitivity)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"[reload] keeping previous config: {e}")
+            return
+
+        for key in ("mic", "vad", "reload"):
+            if new_cfg.get(key) != cfg.get(key):
+                print(f"[reload] '{key}' changed; restart the daemon to apply it")
+
+        cfg, settings, cmd_rec = new_cfg, new, new_cmd_rec
+        detector.threshold = settings.sensitivity
+        if cmd_rec is not None:
+            cmd_rec.sensitivity = settings.fc_sensitivity
+        if dir_changed:
+            detector.label = settings.label
+            detector.dir = Path(settings.template_dir)
+            if cmd_rec is not None:
+                cmd_rec.dir = Path(settings.template_dir)
+            if tpl_watch is not None:
+                tpl_watch = PathWatcher(settings.template_dir, "*.npz", interval=rl_interval)
+            sync_templates()
+        print("[reload] config applied")
+
+    def poll_reload() -> None:
+        if cfg_watch is not None and cfg_watch.changed():
+            try:
+                new_cfg = load_cfg(args.config)
+            except (OSError, yaml.YAMLError) as e:
+                print(f"[reload] keeping previous config: {e}")
+                new_cfg = None
+            if isinstance(new_cfg, dict):
+                apply_cfg(new_cfg)
+            elif new_cfg is not None:
+                print("[reload] keeping previous config: not a mapping")
+        if tpl_watch is not None and tpl_watch.changed():
+            sync_templates()
 
     # Rolling buffer for wakeword analysis (~1.2s)
     buf_sec = 1.2
@@ -97,6 +162,7 @@ def main() -> None:
 
     while True:
         frame = next(frames_iter)
+        poll_reload()
         if vad and not vad.is_speech(frame):
             continue
         f32 = int16_to_float32(frame)
@@ -108,11 +174,11 @@ def main() -> None:
 
         ok, score = detector.detected(f32_buf)
         if ok:
-            print(f"[wake] '{label}' score={score:.2f}")
+            print(f"[wake] '{settings.label}' score={score:.2f}")
 
-            if fc_enabled and cmd_rec is not None and cmd_rec.db:
+            if settings.fc_enabled and cmd_rec is not None and cmd_rec.db:
                 # Capture a short command window and classify using the existing stream
-                needed_frames = int(np.ceil((fc_window_sec * 1000.0) / frame_ms))
+                needed_frames = int(np.ceil((settings.fc_window_sec * 1000.0) / frame_ms))
                 collected: list[np.ndarray] = []
                 for _ in range(needed_frames):
                     next_frame = next(frames_iter)
@@ -122,21 +188,21 @@ def main() -> None:
                 cmd_f32 = int16_to_float32(cmd_int16)
                 lab, cscore = cmd_rec.best_label(cmd_f32)
                 if lab is not None:
-                    action_name = fc_map.get(lab)
+                    action_name = settings.fc_map.get(lab)
                     print(f"[cmd] '{lab}' score={cscore:.2f} -> {action_name}")
                     if action_name:
                         if not is_ide_action(action_name):
                             play_confirm_sound()
-                        dispatch(action_name, cfg.get("actions", {}), device, sr)
+                        dispatch(action_name, settings.actions, device, sr, vad_aggr)
                     else:
                         # No mapping -> fallback
-                        dispatch(fc_default, cfg.get("actions", {}), device, sr)
+                        dispatch(settings.fc_default, settings.actions, device, sr, vad_aggr)
                 else:
-                    print(f"[cmd] uncertain score={cscore:.2f} -> default {fc_default}")
-                    dispatch(fc_default, cfg.get("actions", {}), device, sr)
+                    print(f"[cmd] uncertain score={cscore:.2f} -> default {settings.fc_default}")
+                    dispatch(settings.fc_default, settings.actions, device, sr, vad_aggr)
             else:
                 # Run default pipeline
-                run_actions(on_detect, cfg.get("actions", {}), device, sr)
+                run_actions(settings.on_detect, settings.actions, device, sr, vad_aggr)
 
             # Clear buffer after trigger to avoid immediate re-trigger
             f32_buf = np.zeros((0,), dtype=np.float32)
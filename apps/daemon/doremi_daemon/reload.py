@@ -0,0 +1,110 @@
+"""
+Hot reload: polling watchers plus the parser for config settings that can change live.
+"""
+from __future__ import annotations
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+
+class PathWatcher:
+    """
+    Detects changes to a file, or to the files matching a glob in a directory,
+    by comparing stat() signatures. Polling is rate-limited so it is cheap
+    enough to call between audio frames.
+
+    Args:
+        path: file or directory to watch.
+        pattern: glob within `path` (directory mode); None watches `path` itself.
+        interval: minimum seconds between two stat() sweeps.
+    """
+
+    def __init__(self, path: str | Path, pattern: str | None = None, interval: float = 1.0):
+        self.path = Path(path)
+        self.pattern = pattern
+        self.interval = interval
+        self._next_poll = time.monotonic() + interval
+        self._sig = self._signature()
+
+    def _signature(self) -> Tuple[Tuple[str, int, int], ...]:
+        """Returns (name, mtime_ns, size) for every watched file."""
+        if self.pattern is None:
+            paths = [self.path]
+        elif self.path.is_dir():
+            paths = sorted(self.path.glob(self.pattern))
+        else:
+            paths = []
+        sig = []
+        for p in paths:
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            sig.append((p.name, st.st_mtime_ns, st.st_size))
+        return tuple(sig)
+
+    def changed(self) -> bool:
+        """
+        Returns True once per detected change. Calls made before `interval`
+        has elapsed since the last sweep return False without touching disk.
+        """
+        now = time.monotonic()
+        if now < self._next_poll:
+            return False
+        self._next_poll = now + self.interval
+        sig = self._signature()
+        if sig == self._sig:
+            return False
+        self._sig = sig
+        return True
+
+
+@dataclass(frozen=True)
+class DetectorSettings:
+    """
+    The hot-reloadable part of the config: wakeword, follow-command and actions.
+    Built by `parse_settings` both at startup and on every reload.
+    """
+
+    label: str
+    template_dir: str
+    sensitivity: float
+    fc_enabled: bool
+    fc_window_sec: float
+    fc_sensitivity: float
+    fc_default: str
+    fc_map: Dict[str, str]
+    on_detect: List[str]
+    actions: Dict[str, Any]
+
+
+def _section(cfg: dict, key: str, kind: type = dict) -> Any:
+    """Returns cfg[key], treating a missing or empty (null) value as empty."""
+    value = cfg.get(key) or kind()
+    if not isinstance(value, kind):
+        raise TypeError(f"'{key}' must be a {kind.__name__}")
+    return value
+
+
+def parse_settings(cfg: dict) -> DetectorSettings:
+    """
+    Parses and validates the reloadable settings from a loaded YAML config.
+
+    Raises:
+        ValueError / TypeError on malformed values.
+    """
+    ww = _section(cfg, "wakeword")
+    fc = _section(cfg, "follow_command")
+    return DetectorSettings(
+        label=str(ww.get("label", "doremi")),
+        template_dir=str(_section(ww, "enroll").get("template_dir", "templates")),
+        sensitivity=float(ww.get("sensitivity", 0.6)),
+        fc_enabled=bool(fc.get("enabled", False)),
+        fc_window_sec=float(fc.get("window_seconds", 1.2)),
+        fc_sensitivity=float(fc.get("sensitivity", 0.65)),
+        fc_default=str(fc.get("default_on_uncertain", "ide:record")),
+        fc_map=_section(fc, "map"),
+        on_detect=list(_section(cfg, "actions_on_detect", list)),
+        actions=_section(cfg, "actions"),
+    )
@@ -2,9 +2,108 @@
 Local STT via faster-whisper.
 """
 from __future__ import annotations
-from typing import Any, Dict
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
 
-from faster_whisper import WhisperModel
+import numpy as np
+from faster_whisper import WhisperModel, decode_audio
+
+from .vad import VADGate
+
+# faster-whisper expects 16 kHz mono float32 when given raw samples
+_SR = 16000
+# Whisper encodes audio in fixed 30 s windows; a padded chunk must fit in one
+WINDOW_SECONDS = 30.0
+# Speech used for the one-off language detection in `transcribe_chunked`
+_DETECT_SECONDS = 10.0
+
+# (start, end, text, [(word_start, word_end, word), ...]) relative to the chunk
+_Segment = Tuple[float, float, str, List[Tuple[float, float, str]]]
+
+
+def _keep_words(seg: _Segment, offset: float, keep_lo: float, keep_hi: float) -> Dict[str, Any] | None:
+    """
+    Trims a chunk segment to the words whose midpoint lies in [keep_lo, keep_hi),
+    so audio decoded twice in the overlap only contributes once.
+
+    Returns:
+        {"start", "end", "text"} in absolute seconds, or None if nothing is kept.
+    """
+    start, end, text, words = seg
+    if not words:
+        # No word timings: fall back to the whole segment, clipped to the span
+        mid = offset + 0.5 * (start + end)
+        if not keep_lo <= mid < keep_hi:
+            return None
+        kept = [(start + offset, end + offset, text)]
+    else:
+        kept = [
+            (ws + offset, we + offset, w)
+            for ws, we, w in words
+            if keep_lo <= offset + 0.5 * (ws + we) < keep_hi
+        ]
+        if not kept:
+            return None
+    return {
+        "start": round(max(kept[0][0], keep_lo), 3),
+        "end": round(min(kept[-1][1], keep_hi), 3),
+        "text": "".join([w for _, _, w in kept]),
+    }
+
+
+def _silent_frames(
+    x_int16: np.ndarray, sr: int, frame_ms: int = 30, aggressiveness: int = 2
+) -> Tuple[List[bool], int]:
+    """
+    Runs VAD over the whole signal once, at the given webrtcvad aggressiveness (0..3).
+
+    Returns:
+        (per-frame silence flags, frame length in samples)
+    """
+    vad = VADGate(aggressiveness=aggressiveness, sample_rate=sr, frame_ms=frame_ms)
+    n = vad.frame_len
+    return ([not vad.is_speech(x_int16[i:i + n]) for i in range(0, x_int16.size - n + 1, n)], n)
+
+
+def _first_speech(silent: List[bool], frame_len: int) -> int:
+    """Sample index of the first speech frame, or 0 if VAD found none."""
+    for j, s in enumerate(silent):
+        if not s:
+            return j * frame_len
+    return 0
+
+
+def _silence_cuts(silent: List[bool], frame_len: int, max_seconds: float, frame_ms: int = 30) -> List[int]:
+    """
+    Picks cut points so that no piece is longer than `max_seconds`, preferring
+    the middle of the longest VAD silence in the second half of each piece.
+
+    Args:
+        silent: per-frame silence flags from `_silent_frames`.
+        frame_len: VAD frame length in samples.
+        max_seconds: upper bound on piece length.
+        frame_ms: VAD frame size used for `silent`.
+
+    Returns:
+        Sorted sample indices to cut at (excluding 0 and len).
+    """
+    max_frames = max(2, int(max_seconds * 1000.0 / frame_ms))
+
+    cuts: List[int] = []
+    start = 0
+    while len(silent) - start > max_frames:
+        lo, hi = start + max_frames // 2, start + max_frames
+        best_len, best_mid = 0, hi  # no silence found -> hard cut at the limit
+        run = 0
+        for j in range(lo, hi):
+            run = run + 1 if silent[j] else 0
+            if run > best_len:
+                best_len, best_mid = run, j - run // 2
+        cuts.append(best_mid)
+        start = best_mid
+    return [c * frame_len for c in cuts]
 
 
 class LocalWhisper:
@@ -14,19 +113,130 @@ class LocalWhisper:
     Args:
         model_name: e.g. "tiny", "base", "small", "medium", "large-v3".
         compute_type: e.g. "int8", "int8_float16", "float16", "int8x4".
+        num_workers: concurrent transcriptions the model can serve; used by
+            `transcribe_chunked`. CPU threads are split evenly across workers.
     """
 
-    def __init__(self, model_name: str = "tiny", compute_type: str = "int8"):
-        self.model = WhisperModel(model_name, compute_type=compute_type)
+    def __init__(self, model_name: str = "tiny", compute_type: str = "int8", num_workers: int = 1):
+        self.num_workers = max(1, num_workers)
+        if self.num_workers > 1:
+            cpu_threads = max(1, (os.cpu_count() or 1) // self.num_workers)
+            self.model = WhisperModel(
+                model_name,
+                compute_type=compute_type,
+                cpu_threads=cpu_threads,
+                num_workers=self.num_workers,
+            )
+        else:
+            self.model = WhisperModel(model_name, compute_type=compute_type)
 
-    def transcribe(self, wav_path: str) -> Dict[str, Any]:
+    def transcribe(self, wav_path: str, language: str | None = None) -> Dict[str, Any]:
         """
         Runs transcription and returns a simple JSON payload.
+        `language` (e.g. "en") skips detection; None auto-detects.
         """
-        segments, info = self.model.transcribe(wav_path, beam_size=1)
+        segments, info = self.model.transcribe(wav_path, beam_size=1, language=language)
         text = "".join([seg.text for seg in segments])
         return {
             "language": info.language,
             "duration": info.duration,
             "text": text.strip(),
         }
+
+    def _detect_language(self, audio: np.ndarray) -> str:
+        """Detects the spoken language without decoding any text."""
+        if hasattr(self.model, "detect_language"):  # faster-whisper >= 1.1
+            language, _, _ = self.model.detect_language(audio)
+            return language
+        # transcribe() runs detection eagerly; the segment generator is never consumed
+        _, info = self.model.transcribe(audio, beam_size=1)
+        return info.language
+
+    def _transcribe_chunk(self, audio: np.ndarray, language: str) -> Tuple[List[_Segment], float]:
+        """Decodes one chunk with word timestamps; returns (segments, wall seconds)."""
+        t0 = time.perf_counter()
+        segments, _ = self.model.transcribe(audio, beam_size=1, word_timestamps=True, language=language)
+        # segments is lazy; consume it here so the work happens on this thread
+        segs = [
+            (seg.start, seg.end, seg.text, [(w.start, w.end, w.word) for w in (seg.words or [])])
+            for seg in segments
+        ]
+        return (segs, time.perf_counter() - t0)
+
+    def transcribe_chunked(
+        self,
+        wav_path: str,
+        max_chunk_seconds: float = 30.0,
+        overlap_seconds: float = 0.5,
+        language: str | None = None,
+        vad_aggressiveness: int = 2,
+    ) -> Dict[str, Any]:
+        """
+        Splits long audio at VAD silences (webrtcvad at `vad_aggressiveness`,
+        normally the daemon's vad.aggressiveness), transcribes the pieces concurrently
+        on `num_workers` model workers, and stitches them back in order.
+
+        Pieces are cut at `max_chunk_seconds - 2 * overlap_seconds` (with
+        `max_chunk_seconds` capped at WINDOW_SECONDS) so that, once padded by
+        `overlap_seconds` on both sides, each fits in a single Whisper window.
+        A word is kept only by the piece whose (unpadded) span contains its
+        midpoint, and segments are rebuilt from the kept words, so the overlap
+        is never transcribed twice and segment timestamps do not overlap.
+
+        The language is detected once (unless `language` is given) on the
+        first `_DETECT_SECONDS` of speech and forced on every piece, so a
+        dictation is decoded in one language. This detection is one serial
+        encoder pass on a single worker's share of the CPU threads before any
+        piece starts; set `language` to skip it.
+
+        Returns:
+            Same keys as `transcribe`, plus "segments" and per-chunk "chunks" timings.
+        """
+        t0 = time.perf_counter()
+        audio = decode_audio(wav_path, sampling_rate=_SR)
+        pcm = (audio * 32767.0).clip(-32768, 32767).astype(np.int16)
+        piece_seconds = max(1.0, min(max_chunk_seconds, WINDOW_SECONDS) - 2 * overlap_seconds)
+        silent, frame_len = _silent_frames(pcm, _SR, aggressiveness=vad_aggressiveness)
+        bounds = [0, *_silence_cuts(silent, frame_len, piece_seconds), audio.size]
+        ov = int(overlap_seconds * _SR)
+
+        spans: List[Tuple[int, int, int, int]] = []  # (keep_lo, keep_hi, pad_lo, pad_hi)
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            spans.append((lo, hi, max(0, lo - ov), min(audio.size, hi + ov)))
+
+        if language is None:
+            lo = _first_speech(silent, frame_len)
+            language = self._detect_language(audio[lo:lo + int(_DETECT_SECONDS * _SR)])
+
+        with ThreadPoolExecutor(max_workers=self.num_workers) as pool:
+            futures = [pool.submit(self._transcribe_chunk, audio[a:b], language) for _, _, a, b in spans]
+            results = [f.result() for f in futures]
+
+        segments: List[Dict[str, Any]] = []
+        chunks: List[Dict[str, Any]] = []
+        for i, ((lo, hi, pad_lo, _), (segs, secs)) in enumerate(zip(spans, results)):
+            offset = pad_lo / _SR
+            keep_lo, keep_hi = lo / _SR, hi / _SR
+            kept = 0
+            for seg in segs:
+                trimmed = _keep_words(seg, offset, keep_lo, keep_hi)
+                if trimmed is not None:
+                    segments.append(trimmed)
+                    kept += 1
+            chunks.append({
+                "index": i,
+                "start": round(keep_lo, 3),
+                "end": round(keep_hi, 3),
+                "segments": kept,
+                "seconds": round(secs, 3),
+            })
+
+        return {
+            "language": language,
+            "duration": audio.size / _SR,
+            "text": "".join([s["text"] for s in segments]).strip(),
+            "segments": segments,
+            "chunks": chunks,
+            "workers": self.num_workers,
+            "wall_seconds": round(time.perf_counter() - t0, 3),
+        }